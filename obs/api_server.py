@@ -6,7 +6,7 @@ Flask web server with WebSocket support to provide REST API endpoints
 and real-time communication for the frontend.
 """
 
-from flask import Flask, jsonify, request, send_file, abort
+from flask import Flask, Response, jsonify, request, send_file, abort
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import asyncio
@@ -15,12 +15,12 @@ import threading
 import time
 import os
 import shutil
-import cv2
 from pathlib import Path
 from datetime import datetime
 from recording_manager import RecordingManager
 from main import StreamAIApp
 from video_processor import StreamAIVideoProcessor
+from stream_analytics import StreamAnalytics
 from vultr_service import vultr_service
 
 app = Flask(__name__)
@@ -35,6 +35,9 @@ stream_app = StreamAIApp()
 # Initialize video processor
 video_processor = StreamAIVideoProcessor()
 
+# Initialize stream analytics
+stream_analytics = StreamAnalytics()
+
 # Global variables for live updates
 live_update_thread = None
 live_update_active = False
@@ -145,6 +148,23 @@ def get_obs_data():
     finally:
         loop.close()
 
+@app.route('/api/analytics', methods=['GET'])
+def get_stream_analytics():
+    """Get detailed stream analytics"""
+    try:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        
+        analytics_json = loop.run_until_complete(stream_analytics.get_detailed_analytics_json())
+        if analytics_json is None:
+            return jsonify({"error": "Cannot get analytics: OBS not connected"}), 503
+        
+        return Response(analytics_json, mimetype='application/json')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        loop.close()
+
 @app.route('/api/youtube/data', methods=['GET'])
 def get_youtube_data():
     """Get YouTube data"""
@@ -670,7 +690,9 @@ def serve_recording_thumbnail(recording_id):
         # Generate thumbnail if it doesn't exist
         if not thumbnail_path.exists():
             try:
-                # Use OpenCV to extract first frame
+                # Use OpenCV to extract first frame; imported here so the
+                # server does not load it until a thumbnail is needed
+                import cv2
                 cap = cv2.VideoCapture(str(video_path))
                 ret, frame = cap.read()
                 cap.release()
@@ -17,18 +17,39 @@ import signal
 import os
 from pathlib import Path
 
+# Créer le dossier logs avant que le FileHandler en ait besoin
+Path('logs').mkdir(parents=True, exist_ok=True)
+
 # Configuration des logs
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/launch_all.log'),
+        logging.FileHandler('logs/launch_all.log', delay=True),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
 
+_HR = "=" * 60
+
+_READY_BANNER = "\n".join([
+    "🎉 SYSTÈME COMPLET OPÉRATIONNEL !",
+    _HR,
+    "🌐 Serveur Vultr : http://45.32.145.22",
+    "📱 Interface StreamAI : http://localhost:5000",
+    "🔧 API StreamAI : http://localhost:5000/api/",
+    _HR,
+    "Fonctionnalités disponibles :",
+    "  • Enregistrement OBS avec interface web",
+    "  • Upload automatique vers serveur Vultr",
+    "  • Traitement vidéo sur serveur Vultr",
+    "  • API REST complète",
+    _HR,
+    "Appuyez sur Ctrl+C pour arrêter tous les services",
+])
+
 class GlobalLauncher:
     """Lanceur global pour StreamAI + Serveur Vultr"""
     
@@ -153,7 +174,7 @@ class GlobalLauncher:
             try:
                 response = requests.get("http://45.32.145.22/health", timeout=5)
                 vultr_ok = response.status_code == 200
-            except:
+            except (requests.ConnectionError, requests.Timeout):
                 pass
             
             # Test de StreamAI
@@ -161,7 +182,7 @@ class GlobalLauncher:
             try:
                 response = requests.get("http://localhost:5000/api/status", timeout=5)
                 streamai_ok = response.status_code == 200
-            except:
+            except (requests.ConnectionError, requests.Timeout):
                 pass
             
             return vultr_ok, streamai_ok
@@ -174,10 +195,7 @@ class GlobalLauncher:
         """Lancer tous les services"""
         try:
             self.logger.info("🎬 LANCEMENT GLOBAL StreamAI + Serveur Vultr")
-            self.logger.info("=" * 60)
-            
-            # Créer le dossier logs
-            Path('logs').mkdir(exist_ok=True)
+            self.logger.info(_HR)
             
             # Configuration des signaux
             self.setup_signal_handlers()
@@ -214,19 +232,7 @@ class GlobalLauncher:
             # 5. Système prêt !
             self.running = True
             
-            self.logger.info("🎉 SYSTÈME COMPLET OPÉRATIONNEL !")
-            self.logger.info("=" * 60)
-            self.logger.info("🌐 Serveur Vultr : http://45.32.145.22")
-            self.logger.info("📱 Interface StreamAI : http://localhost:5000")
-            self.logger.info("🔧 API StreamAI : http://localhost:5000/api/")
-            self.logger.info("=" * 60)
-            self.logger.info("Fonctionnalités disponibles :")
-            self.logger.info("  • Enregistrement OBS avec interface web")
-            self.logger.info("  • Upload automatique vers serveur Vultr")
-            self.logger.info("  • Traitement vidéo sur serveur Vultr")
-            self.logger.info("  • API REST complète")
-            self.logger.info("=" * 60)
-            self.logger.info("Appuyez sur Ctrl+C pour arrêter tous les services")
+            self.logger.info(_READY_BANNER)
             
             # 6. Boucle principale - surveiller les processus
             while self.running:
@@ -264,7 +270,7 @@ class GlobalLauncher:
                 self.streamai_process.terminate()
                 self.streamai_process.wait(timeout=10)
                 self.logger.info("✅ StreamAI arrêté")
-            except Exception as e:
+            except (OSError, subprocess.SubprocessError) as e:
                 self.logger.warning(f"Forçage de l'arrêt de StreamAI : {e}")
                 self.streamai_process.kill()
         
@@ -275,7 +281,7 @@ class GlobalLauncher:
                 self.vultr_process.terminate()
                 self.vultr_process.wait(timeout=10)
                 self.logger.info("✅ Serveur Vultr arrêté")
-            except Exception as e:
+            except (OSError, subprocess.SubprocessError) as e:
                 self.logger.warning(f"Forçage de l'arrêt du serveur Vultr : {e}")
                 self.vultr_process.kill()
         
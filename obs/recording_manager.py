@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import os
 import shutil
+import time
 from datetime import datetime
 from pathlib import Path
 from obs_controller import OBSController
@@ -8,6 +10,14 @@ from youtube_api import YouTubeAPI
 from config import config
 from vultr_service import vultr_service
 
+VIDEO_EXTENSIONS = frozenset({'.mkv', '.mp4', '.avi', '.mov'})
+_SIZE_UNITS = ('KB', 'MB', 'GB')
+
+def _format_size(size_bytes):
+    """Format a byte count in KB, MB or GB; sizes under 1 KB show as fractional KB"""
+    unit = min(max((size_bytes.bit_length() - 1) // 10, 1), len(_SIZE_UNITS))
+    return f"{size_bytes / (1 << unit * 10):.1f} {_SIZE_UNITS[unit - 1]}"
+
 class RecordingManager:
     """Main recording manager that coordinates OBS and YouTube API functionality"""
     
@@ -59,7 +69,7 @@ class RecordingManager:
     def create_session(self, session_name=None):
         """Create a new recording session"""
         if not session_name:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             session_name = f"recording_session_{timestamp}"
         
         session_path = self.recordings_path / session_name
@@ -221,9 +231,10 @@ class RecordingManager:
                     self.logger.warning("Latest file is older than recording start time")
                     return
             
-            # Copy to session folder
+            # Copy to session folder on a worker thread; copy2 uses the
+            # kernel's zero-copy path (sendfile/fcopyfile) where available
             dest_path = self.current_session['path'] / latest_file.name
-            shutil.copy2(latest_file, dest_path)
+            await asyncio.get_running_loop().run_in_executor(None, shutil.copy2, latest_file, dest_path)
             self.logger.info(f"Copied recording to session folder: {dest_path}")
             
             # Update session metadata
@@ -242,7 +253,7 @@ class RecordingManager:
             source_path = Path(obs_recording_path)
             if source_path.exists():
                 dest_path = self.current_session['path'] / source_path.name
-                shutil.copy2(source_path, dest_path)
+                await asyncio.get_running_loop().run_in_executor(None, shutil.copy2, source_path, dest_path)
                 self.logger.info(f"Copied recording to session folder: {dest_path}")
                 
                 # Update session metadata
@@ -285,8 +296,8 @@ class RecordingManager:
                 
                 self.logger.info(f"Uploading to Vultr: {full_path.name}")
                 
-                # Upload the file
-                result = vultr_service.upload_file(
+                # Upload the file without blocking the event loop
+                result = await vultr_service.upload_file_async(
                     full_path,
                     session_name=self.current_session['name'],
                     auto_process=True  # Enable auto-processing on Vultr
@@ -309,7 +320,8 @@ class RecordingManager:
                         'task_id': result['task_id'],
                         'file_name': result['file_name'],
                         'upload_time': result['upload_time'],
-                        'file_size': result['file_size']
+                        'file_size': result['file_size'],
+                        'checksum': result['checksum']
                     })
                     
                 else:
@@ -358,8 +370,12 @@ class RecordingManager:
         """List all recording sessions with frontend-compatible metadata"""
         sessions = []
         if self.recordings_path.exists():
-            for session_dir in self.recordings_path.iterdir():
-                if session_dir.is_dir():
+            with os.scandir(self.recordings_path) as session_entries:
+                for session_entry in session_entries:
+                    if not session_entry.is_dir():
+                        continue
+                    session_dir = Path(session_entry.path)
+                    
                     # Try to load existing metadata first
                     metadata = self.load_session_metadata(session_dir)
                     
@@ -369,25 +385,26 @@ class RecordingManager:
                             sessions.append(metadata)
                             continue
                     
-                    # Generate basic session info for backwards compatibility
-                    video_files = [f for f in session_dir.iterdir() if f.is_file() and f.suffix.lower() in ['.mkv', '.mp4', '.avi', '.mov']]
+                    # Generate basic session info for backwards compatibility:
+                    # one directory pass, one stat per file
+                    files = []
+                    total_size = 0
+                    with os.scandir(session_dir) as file_entries:
+                        for file_entry in file_entries:
+                            if file_entry.is_file():
+                                files.append(file_entry.name)
+                                total_size += file_entry.stat().st_size
+                    video_files = [name for name in files if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS]
                     
-                    # Calculate total size
-                    total_size = sum(f.stat().st_size for f in session_dir.iterdir() if f.is_file())
-                    if total_size >= 1024**3:  # GB
-                        size_str = f"{total_size / (1024**3):.1f} GB"
-                    elif total_size >= 1024**2:  # MB
-                        size_str = f"{total_size / (1024**2):.1f} MB"
-                    else:  # Bytes/KB
-                        size_str = f"{total_size / 1024:.1f} KB"
+                    size_str = _format_size(total_size)
                     
                     # Create relative paths for video files
-                    local_recordings = [str(session_dir.name + '/' + f.name) for f in video_files]
+                    local_recordings = [session_entry.name + '/' + name for name in video_files]
                     
                     session_info = {
                         'id': str(hash(session_dir.name)),
                         'title': session_dir.name,
-                        'date': datetime.fromtimestamp(session_dir.stat().st_ctime).strftime('%Y-%m-%d'),
+                        'date': datetime.fromtimestamp(session_entry.stat().st_ctime).strftime('%Y-%m-%d'),
                         'duration': '0:00:00',  # Unknown for old sessions
                         'size': size_str,
                         'views': 0,
@@ -402,7 +419,7 @@ class RecordingManager:
                         'technical': {
                             'session_path': str(session_dir),
                             'local_recordings': local_recordings,
-                            'files': [f.name for f in session_dir.iterdir() if f.is_file()],
+                            'files': files,
                             'file_size_bytes': total_size
                         }
                     }
@@ -459,14 +476,15 @@ class RecordingManager:
         
         # Get channel info if channel_id provided
         if channel_id:
-            data['channel_info'] = self.youtube_api.get_channel_info(channel_id)
+            channel_info = self.youtube_api.get_channel_info(channel_id)
+            data['channel_info'] = channel_info.as_dict() if channel_info else None
         
         # Search videos if query provided
         if query:
-            data['search_results'] = self.youtube_api.search_videos(query)
+            data['search_results'] = [video.as_dict() for video in self.youtube_api.search_videos(query)]
         
         # Get live streams
-        data['live_streams'] = self.youtube_api.get_live_streams(channel_id)
+        data['live_streams'] = [stream.as_dict() for stream in self.youtube_api.get_live_streams(channel_id)]
         
         return data
     
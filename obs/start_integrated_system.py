@@ -14,35 +14,32 @@ import asyncio
 import logging
 import signal
 import sys
-import threading
 import time
 from pathlib import Path
 
+# Create the logs directory before the file handler needs it
+Path('logs').mkdir(parents=True, exist_ok=True)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('logs/streamai_integrated.log'),
+        logging.FileHandler('logs/streamai_integrated.log', delay=True),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
 
-# Import our services
-from main import StreamAIApp
-from api_server import app, socketio
-from vultr_service import vultr_service
-from config import config
-
 class IntegratedStreamAISystem:
     """Main system coordinator"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.stream_app = StreamAIApp()
-        self.api_server_thread = None
+        self.stream_app = None
+        self.api_server_task = None
+        self.api_server_stop = None
         self.running = False
         
     async def initialize(self):
@@ -50,11 +47,14 @@ class IntegratedStreamAISystem:
         self.logger.info("🚀 Starting StreamAI Integrated System")
         self.logger.info("=" * 60)
         
-        # Create logs directory
-        Path('logs').mkdir(exist_ok=True)
+        # Import our services (deferred so the launcher starts without the OBS/Flask stack)
+        from main import StreamAIApp
+        from vultr_service import vultr_service
+        from config import config
         
         # Initialize main StreamAI app
         self.logger.info("📡 Initializing StreamAI Core...")
+        self.stream_app = StreamAIApp()
         success = await self.stream_app.initialize()
         if not success:
             self.logger.error("❌ Failed to initialize StreamAI Core")
@@ -65,7 +65,7 @@ class IntegratedStreamAISystem:
         # Test Vultr integration
         self.logger.info("🌐 Testing Vultr Integration...")
         if vultr_service.is_configured():
-            connection_test = vultr_service.test_connection()
+            connection_test = await vultr_service.test_connection_async()
             if connection_test['success']:
                 self.logger.info("✅ Vultr service connected and ready")
                 vultr_config = config.get_vultr_config()
@@ -80,28 +80,40 @@ class IntegratedStreamAISystem:
         
         # Get system status
         status = self.stream_app.recording_manager.get_system_status()
-        self.logger.info("📊 System Status:")
-        self.logger.info(f"   • OBS Connected: {'✅' if status['obs_connected'] else '❌'}")
-        self.logger.info(f"   • YouTube API: {'✅' if status['youtube_authenticated'] else '❌'}")
-        self.logger.info(f"   • Recordings Path: {status['recordings_path']}")
+        self.logger.info("\n".join([
+            "📊 System Status:",
+            f"   • OBS Connected: {'✅' if status['obs_connected'] else '❌'}",
+            f"   • YouTube API: {'✅' if status['youtube_authenticated'] else '❌'}",
+            f"   • Recordings Path: {status['recordings_path']}",
+        ]))
         
         return True
     
     def start_api_server(self):
-        """Start the Flask API server in a separate thread"""
-        def run_server():
-            try:
-                self.logger.info("🌐 Starting Web API Server on http://localhost:5000")
-                socketio.run(app, debug=False, host='0.0.0.0', port=5000, use_reloader=False)
-            except Exception as e:
-                self.logger.error(f"❌ API Server error: {e}")
+        """Serve the Flask API from the running event loop"""
+        from api_server import app
+        from asgiref.wsgi import WsgiToAsgi
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config as HypercornConfig
+        
+        self.logger.info("🌐 Starting Web API Server on http://localhost:5000")
         
-        self.api_server_thread = threading.Thread(target=run_server, daemon=True)
-        self.api_server_thread.start()
+        server_config = HypercornConfig()
+        server_config.bind = ["0.0.0.0:5000"]
         
-        # Wait a moment for server to start
-        time.sleep(2)
-        self.logger.info("✅ Web API Server started successfully")
+        self.api_server_stop = asyncio.Event()
+        self.api_server_task = asyncio.create_task(
+            serve(WsgiToAsgi(app), server_config, shutdown_trigger=self.api_server_stop.wait)
+        )
+        self.api_server_task.add_done_callback(self._on_api_server_done)
+    
+    def _on_api_server_done(self, task):
+        """Report an API server that stopped on its own"""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error:
+            self.logger.error(f"❌ API Server error: {error}")
     
     def setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
@@ -127,19 +139,23 @@ class IntegratedStreamAISystem:
             
             self.running = True
             
-            self.logger.info("🎉 StreamAI Integrated System is now running!")
-            self.logger.info("=" * 60)
-            self.logger.info("📱 Web Interface: http://localhost:5000")
-            self.logger.info("🔧 API Endpoints:")
-            self.logger.info("   • System Status: GET /api/status")
-            self.logger.info("   • Start Recording: POST /api/recording/start")
-            self.logger.info("   • Stop Recording: POST /api/recording/stop")
-            self.logger.info("   • List Recordings: GET /api/recordings")
-            self.logger.info("   • Vultr Status: GET /api/vultr/status")
-            self.logger.info("   • Upload to Vultr: POST /api/vultr/upload")
-            self.logger.info("🔄 Auto-upload to Vultr: " + ("ENABLED" if config.get_vultr_config()['auto_upload'] else "DISABLED"))
-            self.logger.info("=" * 60)
-            self.logger.info("Press Ctrl+C to stop the system")
+            from config import config
+            
+            self.logger.info("\n".join([
+                "🎉 StreamAI Integrated System is now running!",
+                "=" * 60,
+                "📱 Web Interface: http://localhost:5000",
+                "🔧 API Endpoints:",
+                "   • System Status: GET /api/status",
+                "   • Start Recording: POST /api/recording/start",
+                "   • Stop Recording: POST /api/recording/stop",
+                "   • List Recordings: GET /api/recordings",
+                "   • Vultr Status: GET /api/vultr/status",
+                "   • Upload to Vultr: POST /api/vultr/upload",
+                "🔄 Auto-upload to Vultr: " + ("ENABLED" if config.get_vultr_config()['auto_upload'] else "DISABLED"),
+                "=" * 60,
+                "Press Ctrl+C to stop the system",
+            ]))
             
             # Keep the system running
             while self.running:
@@ -157,6 +173,8 @@ class IntegratedStreamAISystem:
     
     async def health_check(self):
         """Periodic health check"""
+        from vultr_service import vultr_service
+        
         try:
             # Check if OBS is still connected
             if not self.stream_app.recording_manager.obs_controller.is_connected():
@@ -177,6 +195,14 @@ class IntegratedStreamAISystem:
         
         self.running = False
         
+        # Stop the API server
+        if self.api_server_task and not self.api_server_task.done():
+            self.api_server_stop.set()
+            try:
+                await asyncio.wait_for(self.api_server_task, timeout=5)
+            except asyncio.TimeoutError:
+                self.logger.warning("⚠️ API Server did not stop in time, cancelled")
+        
         # Cleanup StreamAI app
         if self.stream_app:
             await self.stream_app.cleanup()
@@ -5,9 +5,21 @@ Stream Analytics Module - Advanced data analysis for OBS streams
 
 import json
 import asyncio
+import operator
+import types
 from datetime import datetime, timedelta
 from recording_manager import RecordingManager
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# Counters always present in OBSController.get_stream_status() results
+_STREAM_FIELDS = operator.itemgetter('total_frames', 'skipped_frames', 'duration', 'bytes', 'congestion')
+
 class StreamAnalytics:
     """Advanced analytics for stream data"""
     
@@ -24,35 +36,58 @@ class StreamAnalytics:
         
         # Get current data
         obs_data = self.recording_manager.get_obs_data()
+        derived = self._stream_derived(obs_data)
         
         # Calculate analytics
         analytics = {
             'timestamp': datetime.now().isoformat(),
-            'performance_metrics': self._analyze_performance(obs_data),
+            'performance_metrics': self._analyze_performance(derived),
             'audio_analysis': self._analyze_audio(obs_data),
-            'stream_quality': self._analyze_stream_quality(obs_data),
+            'stream_quality': self._analyze_stream_quality(derived),
             'recording_analysis': self._analyze_recording(obs_data),
-            'recommendations': self._generate_recommendations(obs_data)
+            'recommendations': self._generate_recommendations(derived, obs_data.get('audio_sources', []))
         }
         
         await self.recording_manager.cleanup()
         return analytics
     
-    def _analyze_performance(self, obs_data):
-        """Analyze stream performance metrics"""
-        stream_status = obs_data.get('stream_status', {})
+    async def get_detailed_analytics_json(self):
+        """Get comprehensive stream analytics as UTF-8 encoded JSON bytes"""
+        analytics = await self.get_detailed_analytics()
+        if analytics is None:
+            return None
+        return _dumps(analytics)
+    
+    def _stream_derived(self, obs_data):
+        """Extract stream counters once, or None when not streaming"""
+        stream_status = obs_data.get('stream_status') or {}
         
         if not stream_status.get('active'):
+            return None
+        
+        total_frames, skipped_frames, duration_ms, bytes_sent, congestion = _STREAM_FIELDS(stream_status)
+        
+        return types.SimpleNamespace(
+            duration_seconds=duration_ms / 1000 if duration_ms > 0 else 1,
+            total_frames=total_frames,
+            skipped_frames=skipped_frames,
+            skip_rate=(skipped_frames / total_frames * 100) if total_frames > 0 else 0,
+            bytes_sent=bytes_sent,
+            congestion=congestion
+        )
+    
+    def _analyze_performance(self, derived):
+        """Analyze stream performance metrics"""
+        if derived is None:
             return {'status': 'not_streaming'}
         
-        total_frames = stream_status.get('total_frames', 0)
-        skipped_frames = stream_status.get('skipped_frames', 0)
-        duration_ms = stream_status.get('duration', 0)
+        total_frames = derived.total_frames
+        skipped_frames = derived.skipped_frames
+        duration_seconds = derived.duration_seconds
+        skip_rate = derived.skip_rate
         
         # Calculate metrics
-        duration_seconds = duration_ms / 1000 if duration_ms > 0 else 1
-        fps = total_frames / duration_seconds if duration_seconds > 0 else 0
-        skip_rate = (skipped_frames / total_frames * 100) if total_frames > 0 else 0
+        fps = total_frames / duration_seconds
         
         return {
             'fps': round(fps, 2),
@@ -85,21 +120,17 @@ class StreamAnalytics:
         
         return analysis
     
-    def _analyze_stream_quality(self, obs_data):
+    def _analyze_stream_quality(self, derived):
         """Analyze stream quality metrics"""
-        stream_status = obs_data.get('stream_status', {})
-        
-        if not stream_status.get('active'):
+        if derived is None:
             return {'status': 'not_streaming'}
         
-        bytes_sent = stream_status.get('bytes', 0)
-        duration_ms = stream_status.get('duration', 0)
-        congestion = stream_status.get('congestion', 0)
+        bytes_sent = derived.bytes_sent
+        duration_seconds = derived.duration_seconds
+        congestion = derived.congestion
         
         # Calculate bitrate
-        duration_seconds = duration_ms / 1000 if duration_ms > 0 else 1
-        bitrate_bps = (bytes_sent * 8) / duration_seconds if duration_seconds > 0 else 0
-        bitrate_kbps = bitrate_bps / 1000
+        bitrate_kbps = (bytes_sent * 8) / duration_seconds / 1000
         
         return {
             'bitrate_kbps': round(bitrate_kbps, 2),
@@ -122,17 +153,13 @@ class StreamAnalytics:
             'available_scenes': obs_data.get('scenes_list', [])
         }
     
-    def _generate_recommendations(self, obs_data):
+    def _generate_recommendations(self, derived, audio_sources):
         """Generate optimization recommendations"""
         recommendations = []
         
-        stream_status = obs_data.get('stream_status', {})
-        if stream_status.get('active'):
+        if derived is not None:
             # Check frame drops
-            skip_rate = 0
-            if stream_status.get('total_frames', 0) > 0:
-                skip_rate = (stream_status.get('skipped_frames', 0) / stream_status.get('total_frames', 1)) * 100
-            
+            skip_rate = derived.skip_rate
             if skip_rate > 5:
                 recommendations.append({
                     'type': 'performance',
@@ -141,7 +168,7 @@ class StreamAnalytics:
                 })
             
             # Check congestion
-            congestion = stream_status.get('congestion', 0)
+            congestion = derived.congestion
             if congestion > 0.1:
                 recommendations.append({
                     'type': 'network',
@@ -150,7 +177,6 @@ class StreamAnalytics:
                 })
         
         # Check audio setup
-        audio_sources = obs_data.get('audio_sources', [])
         if len(audio_sources) < 2:
             recommendations.append({
                 'type': 'audio',
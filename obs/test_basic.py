@@ -3,41 +3,42 @@
 Basic test script to verify core functionality without external dependencies
 """
 
+import importlib
 import sys
 import os
-from pathlib import Path
+import time
+
+# (module, attribute) pairs imported on demand by test_imports
+MODULES_TO_IMPORT = [
+    ('config', None),
+    ('obs_controller', 'OBSController'),
+    ('youtube_api', 'YouTubeAPI'),
+    ('recording_manager', 'RecordingManager'),
+]
+
+REQUIRED_FILES = frozenset((
+    'main.py',
+    'config.py',
+    'obs_controller.py',
+    'youtube_api.py',
+    'recording_manager.py',
+    'requirements.txt',
+    '.env.example'
+))
 
 def test_imports():
     """Test if all modules can be imported"""
     print("Testing module imports...")
     
-    try:
-        import config
-        print("✅ config module imported successfully")
-    except Exception as e:
-        print(f"❌ Failed to import config: {e}")
-        return False
-    
-    try:
-        from obs_controller import OBSController
-        print("✅ obs_controller module imported successfully")
-    except Exception as e:
-        print(f"❌ Failed to import obs_controller: {e}")
-        return False
-    
-    try:
-        from youtube_api import YouTubeAPI
-        print("✅ youtube_api module imported successfully")
-    except Exception as e:
-        print(f"❌ Failed to import youtube_api: {e}")
-        return False
-    
-    try:
-        from recording_manager import RecordingManager
-        print("✅ recording_manager module imported successfully")
-    except Exception as e:
-        print(f"❌ Failed to import recording_manager: {e}")
-        return False
+    for module_name, attribute in MODULES_TO_IMPORT:
+        try:
+            module = importlib.import_module(module_name)
+            if attribute:
+                getattr(module, attribute)
+            print(f"✅ {module_name} module imported successfully")
+        except Exception as e:
+            print(f"❌ Failed to import {module_name}: {e}")
+            return False
     
     return True
 
@@ -60,25 +61,15 @@ def test_file_structure():
     """Test file structure and permissions"""
     print("\nTesting file structure...")
     
-    required_files = [
-        'main.py',
-        'config.py',
-        'obs_controller.py',
-        'youtube_api.py',
-        'recording_manager.py',
-        'requirements.txt',
-        '.env.example'
-    ]
+    present = REQUIRED_FILES.intersection(os.listdir('.'))
     
-    all_present = True
-    for file in required_files:
-        if Path(file).exists():
+    for file in sorted(REQUIRED_FILES):
+        if file in present:
             print(f"✅ {file} exists")
         else:
             print(f"❌ {file} missing")
-            all_present = False
     
-    return all_present
+    return present == REQUIRED_FILES
 
 def main():
     """Run all basic tests"""
@@ -94,29 +85,32 @@ def main():
     results = []
     for test_name, test_func in tests:
         print(f"\n--- {test_name} ---")
+        start_ns = time.perf_counter_ns()
         result = test_func()
-        results.append((test_name, result))
+        results.append((test_name, result, time.perf_counter_ns() - start_ns))
     
-    print("\n" + "=" * 40)
-    print("Test Results Summary:")
-    
-    all_passed = True
-    for test_name, result in results:
+    lines = ["", "=" * 40, "Test Results Summary:"]
+    for test_name, result, elapsed_ns in results:
         status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name}: {status}")
-        if not result:
-            all_passed = False
+        lines.append(f"{test_name}: {status} ({elapsed_ns / 1e6:.1f} ms)")
     
+    all_passed = all(result for _, result, _ in results)
     if all_passed:
-        print("\n🎉 All basic tests passed!")
-        print("The core application structure is ready.")
-        print("\nNext steps:")
-        print("1. Install dependencies: pip install -r requirements.txt")
-        print("2. Configure .env file with your API keys")
-        print("3. Set up OBS WebSocket connection")
-        print("4. Run: python main.py test")
+        lines += [
+            "",
+            "🎉 All basic tests passed!",
+            "The core application structure is ready.",
+            "",
+            "Next steps:",
+            "1. Install dependencies: pip install -r requirements.txt",
+            "2. Configure .env file with your API keys",
+            "3. Set up OBS WebSocket connection",
+            "4. Run: python main.py test",
+        ]
     else:
-        print("\n⚠️  Some tests failed. Please check the issues above.")
+        lines += ["", "⚠️  Some tests failed. Please check the issues above."]
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return 0 if all_passed else 1
 
@@ -6,28 +6,39 @@ This script tests the Vultr upload service and integration with the recording sy
 """
 
 import asyncio
+import os
 import sys
 import time
 from pathlib import Path
-from vultr_service import vultr_service
-from config import config
-from recording_manager import RecordingManager
+
+VIDEO_EXTENSIONS = ('.mkv', '.mp4', '.avi', '.mov')
+
+STATUS_POLL_INTERVAL = 0.2  # seconds
+STATUS_POLL_TIMEOUT = 2.0  # seconds
+
+_BAR = "=" * 50
+_RULE = "-" * 30
 
 async def test_vultr_integration():
     """Test Vultr integration functionality"""
+    from vultr_service import vultr_service
+    from config import config
+    
     print("🧪 Testing Vultr Integration")
-    print("=" * 50)
+    print(_BAR)
+    
+    vultr_config = config.get_vultr_config()
+    configured = vultr_service.is_configured()
     
     # Test 1: Configuration
     print("\n1. Testing Vultr Configuration")
-    print("-" * 30)
+    print(_RULE)
     
-    vultr_config = config.get_vultr_config()
     print(f"API URL: {vultr_config['api_url']}")
     print(f"Upload Endpoint: {vultr_config['upload_endpoint']}")
     print(f"Auto Upload: {vultr_config['auto_upload']}")
     
-    if vultr_service.is_configured():
+    if configured:
         print("✅ Vultr service is configured")
     else:
         print("❌ Vultr service is not configured")
@@ -35,9 +46,9 @@ async def test_vultr_integration():
     
     # Test 2: Connection
     print("\n2. Testing Vultr Connection")
-    print("-" * 30)
+    print(_RULE)
     
-    connection_test = vultr_service.test_connection()
+    connection_test = await vultr_service.test_connection_async()
     if connection_test['success']:
         print("✅ Connection to Vultr server successful")
         if connection_test.get('server_info'):
@@ -48,8 +59,9 @@ async def test_vultr_integration():
     
     # Test 3: Recording Manager Integration
     print("\n3. Testing Recording Manager Integration")
-    print("-" * 30)
+    print(_RULE)
     
+    from recording_manager import RecordingManager
     recording_manager = RecordingManager()
     
     try:
@@ -68,31 +80,38 @@ async def test_vultr_integration():
         
         # Test 4: Mock Upload (if we have test files)
         print("\n4. Testing File Upload (Mock)")
-        print("-" * 30)
+        print(_RULE)
         
         # Look for existing recordings to test with
         recordings_path = config.get_recordings_path()
         test_files = []
         
-        if recordings_path.exists():
-            for session_dir in recordings_path.iterdir():
-                if session_dir.is_dir():
-                    video_files = [f for f in session_dir.iterdir() 
-                                 if f.is_file() and f.suffix.lower() in ['.mkv', '.mp4', '.avi', '.mov']]
-                    if video_files:
-                        test_files.extend(video_files[:1])  # Take first video from each session
+        try:
+            with os.scandir(recordings_path) as session_dirs:
+                for session_dir in session_dirs:
+                    if not session_dir.is_dir(follow_symlinks=False):
+                        continue
+                    with os.scandir(session_dir.path) as entries:
+                        for entry in entries:
+                            if entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                                # Take first video from the session, keeping its DirEntry stat
+                                test_files.append((Path(entry.path), entry.stat(follow_symlinks=False)))
+                                break
+                    if test_files:
                         break  # Only test with one file
+        except FileNotFoundError:
+            pass  # No recordings directory yet
         
         if test_files:
-            test_file = test_files[0]
+            test_file, test_file_stat = test_files[0]
             print(f"Testing upload with: {test_file.name}")
-            print(f"File size: {test_file.stat().st_size / (1024*1024):.1f} MB")
+            print(f"File size: {test_file_stat.st_size / (1 << 20):.1f} MB")
             
             # Only test upload if connection was successful
             if connection_test['success']:
                 print("🚀 Starting upload test...")
                 
-                upload_result = vultr_service.upload_file(
+                upload_result = await vultr_service.upload_file_async(
                     test_file,
                     session_name="test_integration",
                     auto_process=False  # Don't auto-process for test
@@ -105,10 +124,14 @@ async def test_vultr_integration():
                     
                     # Test status check
                     print("\n5. Testing Status Check")
-                    print("-" * 30)
+                    print(_RULE)
                     
-                    time.sleep(2)  # Wait a moment
-                    status_result = vultr_service.get_upload_status(upload_result['task_id'])
+                    # Poll until the server reports the task, bounded at STATUS_POLL_TIMEOUT
+                    deadline = time.monotonic() + STATUS_POLL_TIMEOUT
+                    status_result = await vultr_service.get_upload_status_async(upload_result['task_id'])
+                    while not status_result['success'] and time.monotonic() < deadline:
+                        await asyncio.sleep(STATUS_POLL_INTERVAL)
+                        status_result = await vultr_service.get_upload_status_async(upload_result['task_id'])
                     
                     if status_result['success']:
                         print("✅ Status check successful")
@@ -126,7 +149,7 @@ async def test_vultr_integration():
         
         # Test 5: List Uploads
         print("\n6. Testing List Uploads")
-        print("-" * 30)
+        print(_RULE)
         
         if connection_test['success']:
             list_result = vultr_service.list_uploads(limit=5)
@@ -143,7 +166,7 @@ async def test_vultr_integration():
         
         # Test 6: Auto-upload Configuration
         print("\n7. Testing Auto-upload Configuration")
-        print("-" * 30)
+        print(_RULE)
         
         if vultr_config['auto_upload']:
             print("✅ Auto-upload is ENABLED")
@@ -152,27 +175,37 @@ async def test_vultr_integration():
             print("⚠️ Auto-upload is DISABLED")
             print("   Enable with VULTR_AUTO_UPLOAD=true in .env file")
         
-        print("\n" + "=" * 50)
+        print("\n" + _BAR)
         print("🎉 Vultr Integration Test Completed!")
-        print("=" * 50)
+        print(_BAR)
         
         # Summary
-        print("\n📋 Summary:")
-        print(f"✅ Configuration: {'OK' if vultr_service.is_configured() else 'FAILED'}")
-        print(f"✅ Connection: {'OK' if connection_test['success'] else 'FAILED'}")
-        print(f"✅ Recording Manager: OK")
-        print(f"✅ Auto-upload: {'ENABLED' if vultr_config['auto_upload'] else 'DISABLED'}")
+        lines = [
+            "",
+            "📋 Summary:",
+            f"✅ Configuration: {'OK' if configured else 'FAILED'}",
+            f"✅ Connection: {'OK' if connection_test['success'] else 'FAILED'}",
+            "✅ Recording Manager: OK",
+            f"✅ Auto-upload: {'ENABLED' if vultr_config['auto_upload'] else 'DISABLED'}",
+            "",
+        ]
         
         if connection_test['success']:
-            print("\n🚀 Ready to use Vultr integration!")
-            print("   • Start a recording with: python main.py record")
-            print("   • Upload manually via API: POST /api/vultr/upload")
-            print("   • Check status via API: GET /api/vultr/status")
+            lines += [
+                "🚀 Ready to use Vultr integration!",
+                "   • Start a recording with: python main.py record",
+                "   • Upload manually via API: POST /api/vultr/upload",
+                "   • Check status via API: GET /api/vultr/status",
+            ]
         else:
-            print("\n⚠️ Connection issues detected:")
-            print("   • Check Vultr server is running")
-            print("   • Verify VULTR_API_URL in .env file")
-            print("   • Check network connectivity")
+            lines += [
+                "⚠️ Connection issues detected:",
+                "   • Check Vultr server is running",
+                "   • Verify VULTR_API_URL in .env file",
+                "   • Check network connectivity",
+            ]
+        
+        sys.stdout.write("\n".join(lines) + "\n")
         
         return True
         
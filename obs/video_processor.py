@@ -5,13 +5,17 @@ Integrates advanced video editing capabilities using local processing
 """
 
 import asyncio
+import functools
+import json
 import os
+import subprocess
 import sys
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 from dataclasses import dataclass
+from types import MappingProxyType
 
 # Add video_processing directory to path
 video_processing_dir = Path(__file__).parent.parent / "video_processing"
@@ -24,113 +28,128 @@ except ImportError:
     LocalVideoProcessor = None
     LocalProcessingConfig = None
 
+@functools.lru_cache(maxsize=256)
+def _probe_duration(video_path: str, mtime_ns: int, size: int) -> float:
+    """
+    Get a video's duration in seconds from its container metadata
+    
+    mtime_ns and size are only part of the cache key, so a file that is
+    rewritten in place is probed again.
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', video_path],
+            capture_output=True,
+            check=True
+        )
+        return float(json.loads(result.stdout)['format']['duration'])
+    except (OSError, subprocess.CalledProcessError, KeyError, ValueError):
+        # ffprobe missing or unable to read the header: fall back to OpenCV
+        import cv2
+        cap = cv2.VideoCapture(video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        cap.release()
+        return frame_count / fps if fps > 0 else 0
+
 @dataclass
 class VideoEditingPreset:
     """Predefined video editing presets"""
     name: str
     description: str
-    config: Dict[str, Any]
+    config: Mapping[str, Any]
+
+# Settings shared by every preset unless it overrides them
+_BASE_PRESET_CONFIG = MappingProxyType({
+    "subtitle_model": "base",
+    "subtitle_language": "en",
+    "detect_silence": True,
+    "detect_hesitations": True,
+    "detect_filler_words": True,
+    "detect_low_confidence": True,
+    "output_quality": "medium",
+    "create_project_folder": True,
+    "keep_temp_files": False
+})
+
+def _preset(name: str, description: str, **overrides) -> VideoEditingPreset:
+    """Build a preset from the base config plus its own overrides"""
+    return VideoEditingPreset(
+        name=name,
+        description=description,
+        config=MappingProxyType({**_BASE_PRESET_CONFIG, **overrides})
+    )
+
+# Built once at import and shared read-only by every processor instance
+_PRESETS = MappingProxyType({
+    "conservative": _preset(
+        "Conservative",
+        "Gentle editing that keeps most content",
+        silence_threshold=-35,
+        min_silence_duration=2.0,
+        min_segment_duration=1.5,
+        max_gap_merge=5.0,
+        hesitation_threshold=0.7,
+        filler_threshold=0.6,
+        confidence_threshold=0.2,
+        min_text_length=5,
+        detect_low_confidence=False,
+        output_quality="high"
+    ),
+    "balanced": _preset(
+        "Balanced",
+        "Balanced editing for general content",
+        silence_threshold=-28,
+        min_silence_duration=1.2,
+        min_segment_duration=2.5,
+        max_gap_merge=4.0,
+        hesitation_threshold=0.4,
+        filler_threshold=0.3,
+        confidence_threshold=0.35,
+        min_text_length=12
+    ),
+    "aggressive": _preset(
+        "Aggressive",
+        "Heavy editing that removes more content",
+        silence_threshold=-25,
+        min_silence_duration=0.5,
+        min_segment_duration=3.0,
+        max_gap_merge=2.0,
+        hesitation_threshold=0.3,
+        filler_threshold=0.2,
+        confidence_threshold=0.4,
+        min_text_length=15,
+        custom_hesitation_words=["euh", "euuh", "hm", "hmm", "um", "uh"],
+        custom_filler_words=["ben", "alors", "donc", "voilà", "quoi", "like", "you know"]
+    ),
+    "silence_only": _preset(
+        "Silence Only",
+        "Only removes silence, keeps all speech",
+        silence_threshold=-30,
+        min_silence_duration=1.5,
+        min_segment_duration=1.0,
+        max_gap_merge=10.0,
+        hesitation_threshold=1.0,
+        filler_threshold=1.0,
+        confidence_threshold=0.0,
+        min_text_length=1,
+        detect_hesitations=False,
+        detect_filler_words=False,
+        detect_low_confidence=False
+    )
+})
+
+# One LocalProcessingConfig constructor per preset with its settings pre-bound
+_CONFIG_FACTORIES = MappingProxyType({
+    name: functools.partial(LocalProcessingConfig, **preset.config)
+    for name, preset in _PRESETS.items()
+}) if LocalProcessingConfig is not None else MappingProxyType({})
 
 class StreamAIVideoProcessor:
     """Video processor for StreamAI with preset configurations"""
     
     def __init__(self):
-        self.presets = {
-            "conservative": VideoEditingPreset(
-                name="Conservative",
-                description="Gentle editing that keeps most content",
-                config={
-                    "subtitle_model": "base",
-                    "subtitle_language": "en",
-                    "silence_threshold": -35,
-                    "min_silence_duration": 2.0,
-                    "min_segment_duration": 1.5,
-                    "max_gap_merge": 5.0,
-                    "hesitation_threshold": 0.7,
-                    "filler_threshold": 0.6,
-                    "confidence_threshold": 0.2,
-                    "min_text_length": 5,
-                    "detect_silence": True,
-                    "detect_hesitations": True,
-                    "detect_filler_words": True,
-                    "detect_low_confidence": False,
-                    "output_quality": "high",
-                    "create_project_folder": True,
-                    "keep_temp_files": False
-                }
-            ),
-            "balanced": VideoEditingPreset(
-                name="Balanced",
-                description="Balanced editing for general content",
-                config={
-                    "subtitle_model": "base",
-                    "subtitle_language": "en",
-                    "silence_threshold": -28,
-                    "min_silence_duration": 1.2,
-                    "min_segment_duration": 2.5,
-                    "max_gap_merge": 4.0,
-                    "hesitation_threshold": 0.4,
-                    "filler_threshold": 0.3,
-                    "confidence_threshold": 0.35,
-                    "min_text_length": 12,
-                    "detect_silence": True,
-                    "detect_hesitations": True,
-                    "detect_filler_words": True,
-                    "detect_low_confidence": True,
-                    "output_quality": "medium",
-                    "create_project_folder": True,
-                    "keep_temp_files": False
-                }
-            ),
-            "aggressive": VideoEditingPreset(
-                name="Aggressive",
-                description="Heavy editing that removes more content",
-                config={
-                    "subtitle_model": "base",
-                    "subtitle_language": "en",
-                    "silence_threshold": -25,
-                    "min_silence_duration": 0.5,
-                    "min_segment_duration": 3.0,
-                    "max_gap_merge": 2.0,
-                    "hesitation_threshold": 0.3,
-                    "filler_threshold": 0.2,
-                    "confidence_threshold": 0.4,
-                    "min_text_length": 15,
-                    "detect_silence": True,
-                    "detect_hesitations": True,
-                    "detect_filler_words": True,
-                    "detect_low_confidence": True,
-                    "custom_hesitation_words": ["euh", "euuh", "hm", "hmm", "um", "uh"],
-                    "custom_filler_words": ["ben", "alors", "donc", "voilà", "quoi", "like", "you know"],
-                    "output_quality": "medium",
-                    "create_project_folder": True,
-                    "keep_temp_files": False
-                }
-            ),
-            "silence_only": VideoEditingPreset(
-                name="Silence Only",
-                description="Only removes silence, keeps all speech",
-                config={
-                    "subtitle_model": "base",
-                    "subtitle_language": "en",
-                    "silence_threshold": -30,
-                    "min_silence_duration": 1.5,
-                    "min_segment_duration": 1.0,
-                    "max_gap_merge": 10.0,
-                    "hesitation_threshold": 1.0,
-                    "filler_threshold": 1.0,
-                    "confidence_threshold": 0.0,
-                    "min_text_length": 1,
-                    "detect_silence": True,
-                    "detect_hesitations": False,
-                    "detect_filler_words": False,
-                    "detect_low_confidence": False,
-                    "output_quality": "medium",
-                    "create_project_folder": True,
-                    "keep_temp_files": False
-                }
-            )
-        }
+        self.presets = _PRESETS
     
     async def process_video(
         self, 
@@ -159,17 +178,12 @@ class StreamAIVideoProcessor:
         if preset not in self.presets:
             raise ValueError(f"Unknown preset: {preset}. Available presets: {list(self.presets.keys())}")
         
-        # Get preset configuration
-        preset_config = self.presets[preset].config.copy()
-        preset_config["subtitle_language"] = language
-        
         # Create output directory if not specified
         if output_dir is None:
             output_dir = tempfile.mkdtemp(prefix="streamai_video_processing_")
         
         # Create configuration
-        config = LocalProcessingConfig(**preset_config)
-        config.preset_name = preset  # Add preset name for reporting
+        config = _CONFIG_FACTORIES[preset](subtitle_language=language, preset_name=preset)
         
         # Initialize processor
         processor = LocalVideoProcessor(config)
@@ -180,7 +194,12 @@ class StreamAIVideoProcessor:
             if progress_callback:
                 progress_callback(0, "Starting video processing...")
             
-            result = await processor.process_video_locally(video_path, output_dir)
+            def local_progress(progress):
+                # 100 is reported below, once the result is ready
+                if progress_callback and progress < 100:
+                    progress_callback(progress, "Processing video...")
+            
+            result = await processor.process_video_locally(video_path, output_dir, local_progress)
             
             if progress_callback:
                 progress_callback(100, "Video processing completed!")
@@ -214,13 +233,9 @@ class StreamAIVideoProcessor:
     def estimate_processing_time(self, video_path: str) -> Dict[str, Any]:
         """Estimate processing time for a video"""
         try:
-            # Get video duration (simple estimate)
-            import cv2
-            cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            duration = frame_count / fps if fps > 0 else 0
-            cap.release()
+            # Get video duration from the container header
+            stat = os.stat(video_path)
+            duration = _probe_duration(str(video_path), stat.st_mtime_ns, stat.st_size)
             
             # Rough estimate: processing takes 2-5x video duration
             min_time = duration * 2
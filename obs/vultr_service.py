@@ -5,13 +5,58 @@ Vultr Upload Service
 Service for uploading video files to Vultr server for processing.
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import requests
 import logging
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_toolbelt.multipart.encoder import MultipartEncoder, MultipartEncoderMonitor
 from config import config
 
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    from blake3 import blake3 as _new_hasher
+    CHECKSUM_ALGORITHM = "blake3"
+except ImportError:
+    _new_hasher = hashlib.sha256
+    CHECKSUM_ALGORITHM = "sha256"
+
+def _safe_json(response) -> Dict[str, Any]:
+    """Decode a JSON object response body, or return {} if it is not one"""
+    try:
+        body = _loads(response.content)
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+class _HashingReader:
+    """File wrapper that hashes each chunk as the multipart encoder reads it"""
+    
+    def __init__(self, file):
+        self.file = file
+        self.hasher = _new_hasher()
+    
+    def read(self, size=-1):
+        chunk = self.file.read(size)
+        self.hasher.update(chunk)
+        return chunk
+    
+    def fileno(self):
+        return self.file.fileno()
+    
+    def tell(self):
+        return self.file.tell()
+
 class VultrUploadService:
     """Service for uploading files to Vultr server"""
     
@@ -24,6 +69,26 @@ class VultrUploadService:
         
         # Task counter for unique task IDs
         self.task_counter = 0
+        
+        # Shared session so TCP/TLS connections are reused across calls.
+        # urllib3 already sets TCP_NODELAY on its sockets, so status polls
+        # are not held back by Nagle's algorithm.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            # Idempotent methods only, so the upload POST is never replayed;
+            # transient 5xx answers are retried like connection errors
+            max_retries=Retry(
+                total=4,
+                backoff_factor=0.5,
+                status_forcelist=(500, 502, 503, 504),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
     
     def is_configured(self) -> bool:
         """Check if Vultr service is properly configured"""
@@ -39,13 +104,13 @@ class VultrUploadService:
         
         try:
             # Try to ping the server
-            response = requests.get(f"{self.api_url}/health", timeout=10)
+            response = self.session.get(f"{self.api_url}/health", timeout=10)
             
             if response.status_code == 200:
                 return {
                     "success": True,
                     "message": "Vultr server is reachable",
-                    "server_info": response.json() if response.headers.get('content-type', '').startswith('application/json') else None
+                    "server_info": _loads(response.content) if response.headers.get('content-type', '').startswith('application/json') else None
                 }
             else:
                 return {
@@ -60,14 +125,25 @@ class VultrUploadService:
                 "error": f"Connection failed: {str(e)}"
             }
     
-    def upload_file(self, file_path: Path, session_name: str = None, auto_process: bool = False) -> Dict[str, Any]:
+    def upload_file(
+        self,
+        file_path: Path,
+        session_name: str = None,
+        auto_process: bool = False,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> Dict[str, Any]:
         """
         Upload a file to Vultr server
         
+        The multipart body is streamed from disk, so memory use does not
+        grow with the file size. The file is checksummed during the same
+        read and the digest is returned as "checksum".
+        
         Args:
             file_path: Path to the file to upload
             session_name: Optional session name for organization
             auto_process: Whether to automatically start processing
+            progress_callback: Optional callback receiving (percent, message)
             
         Returns:
             Dictionary with upload result
@@ -94,31 +170,41 @@ class VultrUploadService:
             
             # Prepare file for upload
             with open(file_path, 'rb') as file:
-                files = {
-                    'file': (file_path.name, file, 'video/mp4')
-                }
-                
-                # Additional data
-                data = {
+                # Checksum the bytes on their way to the socket instead of a second pass
+                reader = _HashingReader(file)
+                encoder = MultipartEncoder(fields={
                     'task_id': task_id,
                     'session_name': session_name or file_path.stem,
                     'auto_process': str(auto_process).lower(),
-                    'upload_time': time.strftime('%Y-%m-%d %H:%M:%S')
-                }
+                    'upload_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'file': (file_path.name, reader, 'video/mp4')
+                })
+                body = encoder
+                
+                if progress_callback:
+                    last_percent = [-1]
+                    
+                    def report_progress(monitor):
+                        percent = monitor.bytes_read * 100 // monitor.len
+                        if percent != last_percent[0]:
+                            last_percent[0] = percent
+                            progress_callback(percent, f"Uploading {file_path.name}...")
+                    
+                    body = MultipartEncoderMonitor(encoder, report_progress)
                 
                 self.logger.info(f"Uploading file to Vultr: {file_path.name}")
                 self.logger.info(f"Upload URL: {upload_url}")
                 
                 # Upload the file
-                response = requests.post(
+                response = self.session.post(
                     upload_url,
-                    files=files,
-                    data=data,
+                    data=body,
+                    headers={'Content-Type': body.content_type},
                     timeout=300  # 5 minutes timeout for large files
                 )
                 
                 if response.status_code == 200:
-                    result = response.json() if response.headers.get('content-type', '').startswith('application/json') else {}
+                    result = _safe_json(response)
                     
                     self.logger.info(f"File uploaded successfully: {task_id}")
                     
@@ -127,17 +213,14 @@ class VultrUploadService:
                         "task_id": task_id,
                         "file_name": file_path.name,
                         "file_size": file_path.stat().st_size,
+                        "checksum": f"{CHECKSUM_ALGORITHM}:{reader.hasher.hexdigest()}",
                         "upload_time": time.strftime('%Y-%m-%d %H:%M:%S'),
                         "message": result.get('message', 'File uploaded successfully'),
                         "server_response": result
                     }
                 else:
                     error_msg = f"Upload failed with status code: {response.status_code}"
-                    try:
-                        error_detail = response.json().get('error', response.text)
-                        error_msg += f" - {error_detail}"
-                    except:
-                        error_msg += f" - {response.text}"
+                    error_msg += f" - {_safe_json(response).get('error', response.text)}"
                     
                     self.logger.error(error_msg)
                     return {
@@ -185,12 +268,12 @@ class VultrUploadService:
         
         try:
             status_url = f"{self.api_url}/status/{task_id}"
-            response = requests.get(status_url, timeout=10)
+            response = self.session.get(status_url, timeout=10)
             
             if response.status_code == 200:
                 return {
                     "success": True,
-                    "status": response.json()
+                    "status": _loads(response.content)
                 }
             elif response.status_code == 404:
                 return {
@@ -229,12 +312,12 @@ class VultrUploadService:
         try:
             list_url = f"{self.api_url}/uploads"
             params = {"limit": limit}
-            response = requests.get(list_url, params=params, timeout=10)
+            response = self.session.get(list_url, params=params, timeout=10)
             
             if response.status_code == 200:
                 return {
                     "success": True,
-                    "uploads": response.json()
+                    "uploads": _loads(response.content)
                 }
             else:
                 return {
@@ -249,6 +332,20 @@ class VultrUploadService:
                 "error": f"List uploads failed: {str(e)}"
             }
     
+    async def upload_file_async(self, file_path: Path, **kwargs) -> Dict[str, Any]:
+        """Awaitable upload_file that runs on a worker thread instead of the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.upload_file, file_path, **kwargs)
+        )
+    
+    async def get_upload_status_async(self, task_id: str) -> Dict[str, Any]:
+        """Awaitable get_upload_status that runs on a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.get_upload_status, task_id)
+    
+    async def test_connection_async(self) -> Dict[str, Any]:
+        """Awaitable test_connection that runs on a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.test_connection)
+    
     def get_config_info(self) -> Dict[str, Any]:
         """Get current Vultr configuration info"""
         return {
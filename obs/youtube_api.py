@@ -1,9 +1,107 @@
 import logging
+from dataclasses import asdict, dataclass
 from datetime import datetime
+from typing import Union
+from cachetools import TTLCache
 from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
 from googleapiclient.errors import HttpError
 from config import config
 
+try:
+    import orjson
+    
+    class _OrjsonModel(JsonModel):
+        """JsonModel that decodes API responses with orjson"""
+        
+        def deserialize(self, content):
+            try:
+                body = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                return super().deserialize(content)
+            if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+                body = body['data']
+            return body
+    
+    _RESPONSE_MODEL = _OrjsonModel()
+except ImportError:
+    _RESPONSE_MODEL = None
+
+# Maximum number of IDs accepted by a single videos.list request
+VIDEOS_PER_REQUEST = 50
+
+# Retries for 5xx/429 and connection errors; googleapiclient backs off
+# exponentially with random jitter between attempts
+API_RETRIES = 4
+
+@dataclass(frozen=True)
+class ChannelInfo:
+    """Channel summary from channels.list"""
+    __slots__ = ('id', 'title', 'description', 'subscriber_count', 'video_count', 'view_count', 'created_date')
+    
+    id: str
+    title: str
+    description: str
+    subscriber_count: Union[str, int]  # API returns strings; 0 when hidden
+    video_count: Union[str, int]
+    view_count: Union[str, int]
+    created_date: str
+    
+    def as_dict(self):
+        return asdict(self)
+
+@dataclass(frozen=True)
+class VideoHit:
+    """Single video from a search.list response"""
+    __slots__ = ('video_id', 'title', 'description', 'channel_title', 'channel_id', 'published_at', 'thumbnail_url')
+    
+    video_id: str
+    title: str
+    description: str
+    channel_title: str
+    channel_id: str
+    published_at: str
+    thumbnail_url: str
+    
+    def as_dict(self):
+        return asdict(self)
+
+@dataclass(frozen=True)
+class VideoDetails:
+    """Full video record from videos.list"""
+    __slots__ = (
+        'id', 'title', 'description', 'channel_title', 'published_at', 'duration',
+        'view_count', 'like_count', 'comment_count', 'privacy_status', 'upload_status'
+    )
+    
+    id: str
+    title: str
+    description: str
+    channel_title: str
+    published_at: str
+    duration: str
+    view_count: Union[str, int]
+    like_count: Union[str, int]
+    comment_count: Union[str, int]
+    privacy_status: str
+    upload_status: str
+    
+    def as_dict(self):
+        return asdict(self)
+
+def _video_hit(item):
+    """Build a VideoHit from a search.list item"""
+    snippet = item['snippet']
+    return VideoHit(
+        video_id=item['id']['videoId'],
+        title=snippet['title'],
+        description=snippet['description'],
+        channel_title=snippet['channelTitle'],
+        channel_id=snippet['channelId'],
+        published_at=snippet['publishedAt'],
+        thumbnail_url=snippet['thumbnails']['default']['url']
+    )
+
 class YouTubeAPI:
     """YouTube API integration for streaming platform functionality"""
     
@@ -13,6 +111,12 @@ class YouTubeAPI:
         self.api_key = config.get_youtube_api_key()
         self.authenticated = False
         
+        # Response caches, keyed on call arguments (TTL in seconds)
+        self._channel_cache = TTLCache(maxsize=256, ttl=3600)
+        self._search_cache = TTLCache(maxsize=256, ttl=300)
+        self._video_cache = TTLCache(maxsize=1024, ttl=300)
+        self._live_cache = TTLCache(maxsize=64, ttl=30)
+        
         if self.api_key:
             self._initialize_service()
         else:
@@ -21,7 +125,12 @@ class YouTubeAPI:
     def _initialize_service(self):
         """Initialize YouTube API service"""
         try:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+            self.youtube = build('youtube', 'v3', developerKey=self.api_key, cache_discovery=False, static_discovery=True, model=_RESPONSE_MODEL)
+            
+            # Resolve the resource collections once instead of on every call
+            self._search = self.youtube.search()
+            self._channels = self.youtube.channels()
+            self._videos = self.youtube.videos()
             self.authenticated = True
             self.logger.info("YouTube API service initialized successfully")
         except Exception as e:
@@ -38,33 +147,38 @@ class YouTubeAPI:
             self.logger.error("YouTube API not authenticated")
             return None
         
+        cache_key = channel_id or '__mine__'
+        if cache_key in self._channel_cache:
+            return self._channel_cache[cache_key]
+        
         try:
             # If no channel_id provided, get info for authenticated user's channel
             if channel_id:
-                request = self.youtube.channels().list(
+                request = self._channels.list(
                     part='snippet,statistics,status',
                     id=channel_id
                 )
             else:
-                request = self.youtube.channels().list(
+                request = self._channels.list(
                     part='snippet,statistics,status',
                     mine=True
                 )
             
-            response = request.execute()
+            response = request.execute(num_retries=API_RETRIES)
             
             if response['items']:
                 channel = response['items'][0]
-                channel_info = {
-                    'id': channel['id'],
-                    'title': channel['snippet']['title'],
-                    'description': channel['snippet']['description'],
-                    'subscriber_count': channel['statistics'].get('subscriberCount', 0),
-                    'video_count': channel['statistics'].get('videoCount', 0),
-                    'view_count': channel['statistics'].get('viewCount', 0),
-                    'created_date': channel['snippet']['publishedAt']
-                }
-                self.logger.info(f"Retrieved channel info for: {channel_info['title']}")
+                channel_info = ChannelInfo(
+                    id=channel['id'],
+                    title=channel['snippet']['title'],
+                    description=channel['snippet']['description'],
+                    subscriber_count=channel['statistics'].get('subscriberCount', 0),
+                    video_count=channel['statistics'].get('videoCount', 0),
+                    view_count=channel['statistics'].get('viewCount', 0),
+                    created_date=channel['snippet']['publishedAt']
+                )
+                self.logger.info(f"Retrieved channel info for: {channel_info.title}")
+                self._channel_cache[cache_key] = channel_info
                 return channel_info
             else:
                 self.logger.warning("No channel found")
@@ -81,10 +195,14 @@ class YouTubeAPI:
         """Search for videos on YouTube"""
         if not self.authenticated:
             self.logger.error("YouTube API not authenticated")
-            return []
+            return ()
+        
+        cache_key = (query, max_results)
+        if cache_key in self._search_cache:
+            return self._search_cache[cache_key]
         
         try:
-            request = self.youtube.search().list(
+            request = self._search.list(
                 part='snippet',
                 q=query,
                 type='video',
@@ -92,29 +210,19 @@ class YouTubeAPI:
                 order='relevance'
             )
             
-            response = request.execute()
-            videos = []
-            
-            for item in response['items']:
-                video_info = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails']['default']['url']
-                }
-                videos.append(video_info)
+            response = request.execute(num_retries=API_RETRIES)
+            videos = tuple(_video_hit(item) for item in response['items'])
             
             self.logger.info(f"Found {len(videos)} videos for query: {query}")
+            self._search_cache[cache_key] = videos
             return videos
             
         except HttpError as e:
             self.logger.error(f"YouTube API error: {e}")
-            return []
+            return ()
         except Exception as e:
             self.logger.error(f"Failed to search videos: {e}")
-            return []
+            return ()
     
     def get_video_details(self, video_id):
         """Get detailed information about a specific video"""
@@ -122,51 +230,80 @@ class YouTubeAPI:
             self.logger.error("YouTube API not authenticated")
             return None
         
-        try:
-            request = self.youtube.videos().list(
-                part='snippet,statistics,status,contentDetails',
-                id=video_id
-            )
-            
-            response = request.execute()
-            
-            if response['items']:
-                video = response['items'][0]
-                video_details = {
-                    'id': video['id'],
-                    'title': video['snippet']['title'],
-                    'description': video['snippet']['description'],
-                    'channel_title': video['snippet']['channelTitle'],
-                    'published_at': video['snippet']['publishedAt'],
-                    'duration': video['contentDetails']['duration'],
-                    'view_count': video['statistics'].get('viewCount', 0),
-                    'like_count': video['statistics'].get('likeCount', 0),
-                    'comment_count': video['statistics'].get('commentCount', 0),
-                    'privacy_status': video['status']['privacyStatus'],
-                    'upload_status': video['status']['uploadStatus']
-                }
-                self.logger.info(f"Retrieved details for video: {video_details['title']}")
-                return video_details
+        return self.get_video_details_batch([video_id])[0]
+    
+    def get_video_details_batch(self, video_ids):
+        """
+        Get detailed information about several videos
+        
+        Uncached IDs are fetched with one videos.list request per 50 IDs.
+        Returns a list aligned with video_ids, holding None for videos
+        that were not found or could not be fetched.
+        """
+        if not self.authenticated:
+            self.logger.error("YouTube API not authenticated")
+            return [None] * len(video_ids)
+        
+        found = {}
+        missing = []
+        for video_id in dict.fromkeys(video_ids):
+            if video_id in self._video_cache:
+                found[video_id] = self._video_cache[video_id]
             else:
-                self.logger.warning(f"No video found with ID: {video_id}")
-                return None
+                missing.append(video_id)
+        
+        for i in range(0, len(missing), VIDEOS_PER_REQUEST):
+            chunk = missing[i:i + VIDEOS_PER_REQUEST]
+            try:
+                request = self._videos.list(
+                    part='snippet,statistics,status,contentDetails',
+                    id=','.join(chunk),
+                    maxResults=VIDEOS_PER_REQUEST
+                )
                 
-        except HttpError as e:
-            self.logger.error(f"YouTube API error: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"Failed to get video details: {e}")
-            return None
+                response = request.execute(num_retries=API_RETRIES)
+                
+                for video in response['items']:
+                    found[video['id']] = VideoDetails(
+                        id=video['id'],
+                        title=video['snippet']['title'],
+                        description=video['snippet']['description'],
+                        channel_title=video['snippet']['channelTitle'],
+                        published_at=video['snippet']['publishedAt'],
+                        duration=video['contentDetails']['duration'],
+                        view_count=video['statistics'].get('viewCount', 0),
+                        like_count=video['statistics'].get('likeCount', 0),
+                        comment_count=video['statistics'].get('commentCount', 0),
+                        privacy_status=video['status']['privacyStatus'],
+                        upload_status=video['status']['uploadStatus']
+                    )
+                    self._video_cache[video['id']] = found[video['id']]
+                self.logger.info(f"Retrieved details for {len(response['items'])} of {len(chunk)} videos")
+                
+            except HttpError as e:
+                self.logger.error(f"YouTube API error: {e}")
+            except Exception as e:
+                self.logger.error(f"Failed to get video details: {e}")
+        
+        results = [found.get(video_id) for video_id in video_ids]
+        for video_id, details in zip(video_ids, results):
+            if details is None:
+                self.logger.warning(f"No video found with ID: {video_id}")
+        return results
     
     def get_live_streams(self, channel_id=None):
         """Get live streams for a channel"""
         if not self.authenticated:
             self.logger.error("YouTube API not authenticated")
-            return []
+            return ()
+        
+        cache_key = channel_id or '__all__'
+        if cache_key in self._live_cache:
+            return self._live_cache[cache_key]
         
         try:
             if channel_id:
-                request = self.youtube.search().list(
+                request = self._search.list(
                     part='snippet',
                     channelId=channel_id,
                     type='video',
@@ -174,37 +311,26 @@ class YouTubeAPI:
                     maxResults=10
                 )
             else:
-                request = self.youtube.search().list(
+                request = self._search.list(
                     part='snippet',
                     type='video',
                     eventType='live',
                     maxResults=10
                 )
             
-            response = request.execute()
-            live_streams = []
-            
-            for item in response['items']:
-                stream_info = {
-                    'video_id': item['id']['videoId'],
-                    'title': item['snippet']['title'],
-                    'description': item['snippet']['description'],
-                    'channel_title': item['snippet']['channelTitle'],
-                    'channel_id': item['snippet']['channelId'],
-                    'published_at': item['snippet']['publishedAt'],
-                    'thumbnail_url': item['snippet']['thumbnails']['default']['url']
-                }
-                live_streams.append(stream_info)
+            response = request.execute(num_retries=API_RETRIES)
+            live_streams = tuple(_video_hit(item) for item in response['items'])
             
             self.logger.info(f"Found {len(live_streams)} live streams")
+            self._live_cache[cache_key] = live_streams
             return live_streams
             
         except HttpError as e:
             self.logger.error(f"YouTube API error: {e}")
-            return []
+            return ()
         except Exception as e:
             self.logger.error(f"Failed to get live streams: {e}")
-            return []
+            return ()
     
     def create_broadcast(self, title, description, scheduled_start_time=None):
         """Create a YouTube live broadcast (requires OAuth, not API key)"""
@@ -230,7 +356,7 @@ class YouTubeAPI:
         
         try:
             # Make a simple request to validate the API key
-            request = self.youtube.search().list(
+            request = self._search.list(
                 part='snippet',
                 q='test',
                 type='video',
@@ -1,3 +1,5 @@
+import threading
+import numpy as np
 import sounddevice as sd
 
 print("Available audio devices:")
@@ -6,17 +8,83 @@ print(sd.query_devices())
 print("\nDefault device indices [input, output]:")
 print(sd.default.device)
 
-def start_stream(callback, samplerate=16000, blocksize=0, device=None):
+# Resolved once so start_stream does not re-enumerate devices
+DEFAULT_INPUT_DEVICE = sd.default.device[0]
+
+
+class RingBuffer:
+    """Single-producer/single-consumer sample ring written from the PortAudio thread"""
+
+    def __init__(self, capacity, dtype=np.int16):
+        self.buffer = np.empty(capacity, dtype=dtype)
+        # np.zeros maps lazily; writing commits the pages before the PortAudio thread needs them
+        self.buffer.fill(0)
+        self.capacity = capacity
+        self.write_index = 0  # total samples ever written
+        self.read_index = 0  # total samples ever read
+        self.data_ready = threading.Event()
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            self.write_index += n - self.capacity
+            n = self.capacity
+
+        start = self.write_index % self.capacity
+        first = min(n, self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        self.buffer[:n - first] = samples[first:]
+
+        # Publish only after the samples are in place
+        self.write_index += n
+        self.data_ready.set()
+
+    def read(self):
+        """Return a copy of every sample written since the last read"""
+        write_index = self.write_index
+        available = write_index - self.read_index
+        if available > self.capacity:
+            # Consumer fell behind: drop the overwritten samples
+            available = self.capacity
+
+        start = (write_index - available) % self.capacity
+        end = start + available
+        if end <= self.capacity:
+            audio = self.buffer[start:end].copy()
+        else:
+            audio = np.concatenate((self.buffer[start:], self.buffer[:end - self.capacity]))
+
+        self.read_index = write_index
+        return audio
+
+
+def start_stream(callback, samplerate=16000, blocksize=1600, device=None, ring_seconds=5, latency='low'):
+    """Capture mono int16 (Q15, full scale = 32768) audio and hand it to callback off the audio thread"""
     print(f"audio sample captured.")
+    ring = RingBuffer(samplerate * ring_seconds)
+
     def audio_callback(input_data, frames, time, status):
         if status:
             print(f"stream status': {status}" )
-        audio = input_data[:, 0]
-        callback(audio.copy())  # copy audio chunk
+        # Mono int16: copy straight into the ring, no per-block allocation
+        ring.write(np.frombuffer(input_data, dtype=np.int16))
 
     if device is None:
-        device = sd.query_devices(kind="input")["name"]
+        device = DEFAULT_INPUT_DEVICE
+
+    stream = sd.RawInputStream(callback=audio_callback, samplerate=samplerate, blocksize=blocksize, channels=1, dtype='int16', device=device, latency=latency)
+
+    def consume():
+        # Deliver audio to the caller off the realtime audio thread
+        while stream.active:
+            if not ring.data_ready.wait(timeout=0.1):
+                continue
+            ring.data_ready.clear()
+            audio = ring.read()
+            if len(audio):
+                callback(audio)
 
-    stream = sd.InputStream(callback=audio_callback,samplerate=samplerate, blocksize=blocksize, channels=1, device=device)
     stream.start()
+    threading.Thread(target=consume, daemon=True).start()
     return stream
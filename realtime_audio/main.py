@@ -1,31 +1,66 @@
-import numpy as np
+import queue
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from transcription import Transcription
 from audio_capture import start_stream
-from refinement import refine_transcription
+from refinement import stream_refinement
 from console_ui import prompt_message
 
 
+def refine_into(raw_output, user_prompt, tokens):
+    for delta in stream_refinement(raw_output, user_prompt):
+        tokens.put(delta)
+
+
 def main():
     trans = Transcription()
 
     def audiostream_callback(audio_chunk):
-        trans.add_audio(audio_chunk.astype(np.float32))
+        trans.add_audio(audio_chunk)
 
-    stream = start_stream(audiostream_callback, blocksize=3000, device=1)
+    stream = start_stream(audiostream_callback, blocksize=1600, device=1)
 
     user_prompt = prompt_message()
 
+    # Refine on worker threads; stream the oldest refinement's text as it
+    # arrives and print the rest in the order they were spoken
+    refine_pool = ThreadPoolExecutor(max_workers=4)
+    pending = deque()
+    head_started = False
+
     try:
         while True:
             raw_output = trans.get_next_transcription()
             if raw_output:
-                refined = refine_transcription(raw_output, user_prompt)
-                print("[Stream: Groq] Refined:", refined + "\n")
+                tokens = queue.SimpleQueue()
+                pending.append((refine_pool.submit(refine_into, raw_output, user_prompt, tokens), tokens))
+
+            while pending:
+                future, tokens = pending[0]
+                finished = future.done()
+                if not head_started:
+                    sys.stdout.write("[Stream: Groq] Refined: ")
+                    head_started = True
+                while not tokens.empty():
+                    sys.stdout.write(tokens.get())
+                sys.stdout.flush()
+                if not finished:
+                    break
+                future.result()  # surface refinement errors
+                sys.stdout.write("\n\n")
+                pending.popleft()
+                head_started = False
+
+            if not raw_output:
+                time.sleep(0.05)
 
     except KeyboardInterrupt:
         print("Stopping...")
         trans.stop()
         stream.stop()
+        refine_pool.shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -37,7 +37,7 @@ class RealTimeTranscriptionService:
         
         # Audio parameters optimized for real-time processing
         self.sample_rate = 16000
-        self.chunk_size = 1024  # Small chunks for low latency
+        self.chunk_size = 1600  # 100 ms blocks, an even divisor of the transcription step
         self.buffer_duration = 2  # Process audio every 2 seconds for responsiveness
         
         print("🎤 Real-Time Transcription Service")
@@ -76,11 +76,7 @@ class RealTimeTranscriptionService:
         def audio_callback(audio_chunk):
             """Process each audio chunk in real-time"""
             if self.is_listening and len(audio_chunk) > 0:
-                # Convert to float32 if needed
-                if audio_chunk.dtype != np.float32:
-                    audio_chunk = audio_chunk.astype(np.float32)
-                
-                # Send to transcription system
+                # Send raw int16 samples; Transcription scales them for Whisper
                 if self.transcription_system:
                     self.transcription_system.add_audio(audio_chunk)
         
@@ -148,7 +144,7 @@ def main():
             print("✅ API server is running")
         else:
             print("⚠️  API server responded but with error")
-    except:
+    except (requests.ConnectionError, requests.Timeout):
         print("⚠️  Warning: API server may not be running")
         print("   Make sure to start it: python obs/api_server.py")
     
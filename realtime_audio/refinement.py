@@ -1,3 +1,4 @@
+import functools
 import os
 from groq import Groq
 from dotenv import load_dotenv
@@ -8,9 +9,8 @@ client = Groq(
     api_key=os.environ.get("GROQ_API_KEY"),
 )
 
-def refine_transcription(raw_output, prompt_message):
-    # Enhanced system message to prevent questions and ensure clean transcription
-    system_message = f"""You are a professional transcription editor. Your task is to clean up audio transcriptions.
+# Enhanced system message to prevent questions and ensure clean transcription
+_SYSTEM_TEMPLATE = """You are a professional transcription editor. Your task is to clean up audio transcriptions.
 
 {prompt_message}
 
@@ -21,6 +21,14 @@ IMPORTANT RULES:
 - Keep the original meaning intact
 - Focus only on grammar, spelling, punctuation, and clarity improvements"""
 
+@functools.lru_cache(maxsize=32)
+def _build_system(prompt_message):
+    # The prompt rarely changes, so the same string is reused call after call
+    return _SYSTEM_TEMPLATE.format(prompt_message=prompt_message)
+
+def stream_refinement(raw_output, prompt_message):
+    system_message = _build_system(prompt_message)
+
     chat_completion = client.chat.completions.create(
         messages=[
             {
@@ -32,7 +40,14 @@ IMPORTANT RULES:
                 'content' : f"Please clean up this transcription: {raw_output}"
             }
         ],
-        model = 'llama-3.1-8b-instant'  # Faster, less congested model
+        model = 'llama-3.1-8b-instant',  # Faster, less congested model
+        stream = True
     )
-    return chat_completion.choices[0].message.content
+    # Yield text as Groq produces it instead of waiting for the whole reply
+    for chunk in chat_completion:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
 
+def refine_transcription(raw_output, prompt_message):
+    return "".join(stream_refinement(raw_output, prompt_message))
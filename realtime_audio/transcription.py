@@ -1,74 +1,211 @@
+import functools
+import os
 import queue
+import re
 import threading
-import whisper
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import numpy as np
 import requests
 import json
+from datetime import datetime
+from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from requests.adapters import HTTPAdapter
+
+try:
+    from refinement import refine_transcription
+except Exception as e:  # groq missing or no API key configured
+    refine_transcription = None
+    print(f"[Groq] Refinement unavailable: {e}")
+
+
+# Scales Q15 int16 samples to the [-1, 1) float32 range Whisper expects
+Q15_SCALE = np.float32(1.0 / 32768)
+
+# Weight of the newest Whisper timing in the smoothed round latency
+INFERENCE_EWMA_ALPHA = 0.2
+
+# Groq errors that mean "busy, try later" (over capacity or rate limited) rather than a real failure
+_BUSY_STATUS = frozenset({429, 503})
+_BUSY_MESSAGE = re.compile(r"over capacity|rate limit|\b(?:429|503)\b", re.I)
+
+# Pending refinements kept under backpressure; older ones are dropped first
+REFINE_BACKLOG = 8
+
+# Consecutive busy errors (429/503) before refinement pauses, and for how long
+GROQ_FAILURE_LIMIT = 3
+GROQ_PAUSE_SECONDS = 30
+
+# Seconds a fetched refinement prompt is reused before asking the API again
+PROMPT_TTL = 5
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, default=datetime.isoformat).encode()
+
+# Shared by the worker and refinement threads so API calls reuse connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_model(model_name="tiny", device="auto"):
+    """Load a Whisper model once per process and share it between Transcription instances"""
+    print("Loading Whisper model...")
+    # CTranslate2 backend with int8 weights; "auto" picks a CUDA device when present
+    model = WhisperModel(model_name, device=device, compute_type="int8", cpu_threads=os.cpu_count())
+    print("Whisper model loaded.")
+    return model
 
 
 class Transcription:
-    def __init__(self, sample_rate=16000, buffer_duration=1, api_url="http://localhost:5001"):
+    def __init__(self, sample_rate=16000, buffer_duration=1, max_buffer_duration=15, api_url="http://localhost:5001", model_name="tiny"):
         self.sample_rate = sample_rate
-        self.buffer_duration = buffer_duration  # seconds of audio before transcribing
+        self.buffer_duration = buffer_duration  # seconds of new audio per transcription round
+        self.max_buffer_duration = max_buffer_duration  # force a commit past this many buffered seconds
         self.api_url = api_url
 
-        print("Loading Whisper model...")
-        self.model = whisper.load_model("tiny")
-        print("Whisper model loaded.")
+        self.model = get_shared_model(model_name)
 
-        self.audio_queue = queue.Queue()
+        # Rolling audio not yet committed, preallocated to Whisper's 30 s window.
+        # add_audio writes into it directly; _cv guards _write and _pending.
+        self._buf = np.empty(self.sample_rate * 30, dtype=np.float32)
+        self._buf.fill(0)  # touch every page now, not on the first realtime writes
+        self._write = 0  # samples of _buf currently in use
+        self._pending = 0  # samples added since the last transcription round
+        self._cv = threading.Condition()
+        self.buffer_start = 0.0  # stream time of _buf[0], in seconds
+        self.hypothesis = []  # (start, end, word) tuples awaiting agreement
+        self._inference_ewma = 0.0  # smoothed seconds per Whisper round
+        self.vad_options = VadOptions()
         self.refinement_queue = queue.Queue()
 
+        # API posts and Groq refinement run here so they never stall transcription
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="transcription-io")
+        self._prompt = None
+        self._prompt_fetched_at = float('-inf')
+        self._inflight = {}  # (raw text, prompt) -> Future of its refinement
+        self._inflight_lock = threading.Lock()
+        self._refine_backlog = deque(maxlen=REFINE_BACKLOG)
+        self._groq_failures = 0  # consecutive busy (429/503) errors
+        self._groq_paused_until = 0.0
+        self._groq_lock = threading.Lock()  # pool threads share the circuit breaker state
+
         self.running = True
         self.worker_thread = threading.Thread(target=self._work_loop, daemon=True)
         self.worker_thread.start()
 
     def add_audio(self, audio_np):
-        self.audio_queue.put(audio_np)
+        with self._cv:
+            # Only the worker moves data in _buf, so a full buffer drops the newest audio
+            n = min(len(audio_np), len(self._buf) - self._write)
+            if n < len(audio_np):
+                print(f"[Transcription] Buffer full, dropping {len(audio_np) - n} samples")
+            dst = self._buf[self._write:self._write + n]
+            if audio_np.dtype == np.int16:
+                # Convert and scale in one pass, straight into the buffer
+                np.multiply(audio_np[:n], Q15_SCALE, out=dst)
+            else:
+                dst[:] = audio_np[:n]
+            self._write += n
+            self._pending += n
+            self._cv.notify()
 
     def _work_loop(self):
-        buffer = []
-        total_samples = 0
-        min_samples = self.sample_rate * self.buffer_duration
+        while True:
+            # Never ask for rounds faster than Whisper can finish them
+            step_samples = int(self.sample_rate * max(self.buffer_duration, self._inference_ewma))
+            with self._cv:
+                self._cv.wait_for(lambda: self._pending >= step_samples or not self.running)
+                if not self.running:
+                    return
+                new_samples, self._pending = self._pending, 0
+                end = self._write
 
-        while self.running:
-            try:
-                chunk = self.audio_queue.get(timeout=1)
-                if chunk is not None:
-                    buffer.append(chunk)
-                    total_samples += len(chunk)
-
-                if total_samples >= min_samples:
-                    full_audio = np.concatenate(buffer)
-                    buffer = []
-                    total_samples = 0
-
-                    result = self.model.transcribe(full_audio, fp16=False)
-                    transcription = result.get("text", "").strip()
-
-                    if transcription:
-                        print("[Me] Raw:", transcription)
-                        self.refinement_queue.put(transcription)
-                        
-                        # Send raw transcription to API server
-                        self._send_raw_to_api(transcription)
-                        
-                        # Automatically refine and send refined version
-                        self._auto_refine_and_send(transcription)
+            transcription = self._process_buffer(end, new_samples)
+            if transcription:
+                self._emit(transcription)
+
+    def _process_buffer(self, end, new_samples):
+        """Transcribe the first end buffered samples and return the newly committed text"""
+        if not get_speech_timestamps(self._buf[max(end - new_samples, 0):end], self.vad_options):
+            # Silent round: skip Whisper, and treat the pause as a segment boundary
+            committed, self.hypothesis = self.hypothesis, []
+            self._drop(end)
+            return "".join(word[2] for word in committed).strip()
+
+        # add_audio only writes past end, so the view is stable while Whisper reads it
+        started = time.perf_counter()
+        segments, _ = self.model.transcribe(
+            self._buf[:end],
+            beam_size=1,
+            vad_filter=True,
+            condition_on_previous_text=False,
+            word_timestamps=True
+        )
+        words = [
+            (self.buffer_start + word.start, self.buffer_start + word.end, word.word)
+            for segment in segments
+            for word in segment.words
+        ]
+        # segments is lazy, so the time is only known once the words are collected
+        elapsed = time.perf_counter() - started
+        self._inference_ewma += INFERENCE_EWMA_ALPHA * (elapsed - self._inference_ewma)
+
+        # LocalAgreement-2: commit the prefix this round shares with the previous one
+        committed = []
+        for new, old in zip(words, self.hypothesis):
+            if new[2].strip().lower() != old[2].strip().lower():
+                break
+            committed.append(new)
+        self.hypothesis = words[len(committed):]
+
+        if end > self.sample_rate * self.max_buffer_duration:
+            # No agreement for too long: flush everything and start over
+            committed += self.hypothesis
+            self.hypothesis = []
+            self._drop(end)
+        elif committed:
+            self._drop(int((committed[-1][1] - self.buffer_start) * self.sample_rate))
+
+        return "".join(word[2] for word in committed).strip()
 
-            except queue.Empty:
-                continue
+    def _drop(self, cut):
+        """Discard the first cut samples, moving the tail to the front"""
+        with self._cv:
+            cut = min(max(cut, 0), self._write)
+            tail = self._write - cut
+            np.copyto(self._buf[:tail], self._buf[cut:self._write])
+            self._write = tail
+        self.buffer_start += cut / self.sample_rate
+
+    def _emit(self, transcription):
+        print("[Me] Raw:", transcription)
+        self.refinement_queue.put(transcription)
+        
+        # Send raw transcription to API server
+        self._io_pool.submit(self._send_raw_to_api, transcription)
+        
+        # Automatically refine and send refined version
+        self._auto_refine_and_send(transcription)
 
     def _send_raw_to_api(self, transcription):
         """Send raw transcription to API server queue"""
         try:
-            response = requests.post(
+            response = _SESSION.post(
                 f"{self.api_url}/api/transcription/add",
-                json={
+                data=_dumps({
                     "transcription": transcription,
                     "type": "raw",
-                    "timestamp": json.dumps(requests.utils.default_user_agent(), default=str)
-                },
+                    "timestamp": datetime.now()
+                }),
                 headers={"Content-Type": "application/json"},
                 timeout=1
             )
@@ -77,62 +214,116 @@ class Transcription:
         except Exception as e:
             print(f"[API] Error sending raw transcription: {e}")
     
+    def _get_refinement_prompt(self):
+        """Return the refinement prompt, asking the API at most once per PROMPT_TTL seconds"""
+        now = time.monotonic()
+        if now - self._prompt_fetched_at < PROMPT_TTL:
+            return self._prompt
+
+        response = _SESSION.get(
+            f"{self.api_url}/api/transcription/prompt",
+            timeout=2
+        )
+        if not response.ok:
+            print(f"[API] Failed to get refinement prompt: {response.status_code}")
+            return None
+
+        self._prompt = response.json().get('prompt', '')
+        self._prompt_fetched_at = now
+        return self._prompt
+
+    def _refine(self, raw_transcription, prompt):
+        """Refine text with Groq, sharing the result of an identical request already in flight"""
+        if refine_transcription is None:
+            raise RuntimeError("Groq refinement is not available")
+
+        key = (raw_transcription, prompt)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            refined_text = refine_transcription(raw_transcription, prompt)
+            future.set_result(refined_text)
+            return refined_text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
     def _auto_refine_and_send(self, raw_transcription):
         """Automatically refine transcription and send to API"""
         def refine_async():
             try:
-                # Get the current refinement prompt from API
-                response = requests.get(
-                    f"{self.api_url}/api/transcription/prompt",
-                    timeout=2
-                )
+                # The backlog drops its oldest entries when full, so this
+                # task may find its transcript already shed
+                try:
+                    raw_transcription = self._refine_backlog.popleft()
+                except IndexError:
+                    return
                 
-                if response.ok:
-                    prompt_data = response.json()
-                    prompt = prompt_data.get('prompt', '')
-                    
-                    if prompt:
-                        try:
-                            # Import refinement function
-                            from refinement import refine_transcription
-                            
-                            # Refine the transcription
-                            refined_text = refine_transcription(raw_transcription, prompt)
-                            print("[Groq] Refined:", refined_text)
-                            
-                            # Send refined transcription to API
-                            response = requests.post(
-                                f"{self.api_url}/api/transcription/add",
-                                json={
-                                    "transcription": refined_text,
-                                    "type": "refined",
-                                    "original": raw_transcription,
-                                    "timestamp": json.dumps(requests.utils.default_user_agent(), default=str)
-                                },
-                                headers={"Content-Type": "application/json"},
-                                timeout=2
-                            )
+                with self._groq_lock:
+                    if time.monotonic() < self._groq_paused_until:
+                        return
+                
+                # Get the current refinement prompt (cached briefly)
+                prompt = self._get_refinement_prompt()
+                
+                if prompt:
+                    try:
+                        # Refine the transcription
+                        refined_text = self._refine(raw_transcription, prompt)
+                        with self._groq_lock:
+                            self._groq_failures = 0
+                        print("[Groq] Refined:", refined_text)
+                        
+                        # Send refined transcription to API
+                        response = _SESSION.post(
+                            f"{self.api_url}/api/transcription/add",
+                            data=_dumps({
+                                "transcription": refined_text,
+                                "type": "refined",
+                                "original": raw_transcription,
+                                "timestamp": datetime.now()
+                            }),
+                            headers={"Content-Type": "application/json"},
+                            timeout=2
+                        )
+                        
+                        if not response.ok:
+                            print(f"[API] Failed to send refined transcription: {response.status_code}")
                             
-                            if not response.ok:
-                                print(f"[API] Failed to send refined transcription: {response.status_code}")
-                                
-                        except Exception as groq_error:
-                            error_msg = str(groq_error)
-                            if "over capacity" in error_msg or "503" in error_msg:
-                                print(f"[Groq] API over capacity, skipping refinement for: {raw_transcription[:50]}...")
-                            else:
-                                print(f"[Groq] Refinement error: {error_msg}")
-                    else:
-                        print("[Groq] No refinement prompt set, skipping refinement")
-                else:
-                    print(f"[API] Failed to get refinement prompt: {response.status_code}")
+                    except Exception as groq_error:
+                        error_msg = str(groq_error)
+                        if getattr(groq_error, 'status_code', None) in _BUSY_STATUS or _BUSY_MESSAGE.search(error_msg):
+                            print(f"[Groq] API busy (rate limited or over capacity), skipping refinement for: {raw_transcription[:50]}...")
+                            with self._groq_lock:
+                                self._groq_failures += 1
+                                pause = self._groq_failures >= GROQ_FAILURE_LIMIT
+                                if pause:
+                                    # Stop hammering an overloaded API for a while
+                                    self._groq_failures = 0
+                                    self._groq_paused_until = time.monotonic() + GROQ_PAUSE_SECONDS
+                            if pause:
+                                print(f"[Groq] Pausing refinement for {GROQ_PAUSE_SECONDS}s")
+                        else:
+                            print(f"[Groq] Refinement error: {error_msg}")
+                elif prompt is not None:
+                    print("[Groq] No refinement prompt set, skipping refinement")
                     
             except Exception as e:
                 print(f"[Refinement] Error: {e}")
         
-        # Run refinement in a separate thread to avoid blocking
-        refinement_thread = threading.Thread(target=refine_async, daemon=True)
-        refinement_thread.start()
+        # Run refinement on the I/O pool to avoid blocking
+        self._refine_backlog.append(raw_transcription)
+        self._io_pool.submit(refine_async)
 
     def get_next_transcription(self):
         try:
@@ -141,4 +332,7 @@ class Transcription:
             return None
 
     def stop(self):
-        self.running = False
+        with self._cv:
+            self.running = False
+            self._cv.notify()
+        self._io_pool.shutdown(wait=False)